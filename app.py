@@ -1,30 +1,61 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, List, Optional
 
-from flask import Flask, jsonify, render_template, request
+import orjson
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import JSONProvider
 
-from search import ProductSearchEngine
+from search import ProductSearchEngine, SearchResult
 from utils import parse_column_map
 
 CSV_PATH = os.getenv("PRODUCTS_CSV", "products.csv")
 COLUMN_MAP_JSON = os.getenv("COLUMN_MAP_JSON", "")
 COLUMN_OVERRIDE = parse_column_map(COLUMN_MAP_JSON)
+MAX_BATCH_QUERIES = int(os.getenv("MAX_BATCH_QUERIES", "50"))
+
+
+class OrjsonProvider(JSONProvider):
+    """JSON provider backed by orjson; also serializes NumPy scalars and arrays."""
+
+    options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        return orjson.dumps(obj, option=self.options).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, option=self.options), mimetype="application/json")
+
 
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 engine: ProductSearchEngine | None = None
 startup_error: str | None = None
+_engine_lock = threading.Lock()
 
 
-@app.before_request
-def lazy_load_engine() -> None:
+def get_engine() -> ProductSearchEngine | None:
+    """Build the engine exactly once, even when the first requests arrive concurrently."""
     global engine, startup_error
     if engine is None and startup_error is None:
-        try:
-            engine = ProductSearchEngine(CSV_PATH, COLUMN_OVERRIDE)
-        except Exception as exc:  # noqa: BLE001 - convert errors into UI message
-            startup_error = str(exc)
+        with _engine_lock:
+            if engine is None and startup_error is None:
+                try:
+                    engine = ProductSearchEngine(CSV_PATH, COLUMN_OVERRIDE)
+                except Exception as exc:  # noqa: BLE001 - convert errors into UI message
+                    startup_error = str(exc)
+    return engine
+
+
+@app.before_request
+def lazy_load_engine() -> None:
+    get_engine()
 
 
 @app.route("/", methods=["GET"])
@@ -42,38 +73,27 @@ def index() -> str:
     return render_template("index.html", categories=engine.categories, examples=examples, error=None)
 
 
-@app.route("/search", methods=["POST"])
-def search() -> Any:
-    if startup_error:
-        return jsonify({"error": startup_error}), 500
+def _as_float(value: Any) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
 
-    assert engine is not None
-    payload: Dict[str, Any] = request.get_json(silent=True) or {}
-    query = str(payload.get("query", "")).strip()
-    min_price = payload.get("min_price")
-    max_price = payload.get("max_price")
-    min_rating = payload.get("min_rating")
-    category = payload.get("category") or None
-    debug = bool(payload.get("debug", False))
-
-    def as_float(value: Any):
-        try:
-            return float(value) if value not in (None, "") else None
-        except (TypeError, ValueError):
-            return None
-
-    results, diagnostics = engine.search(
-        query,
-        min_price=as_float(min_price),
-        max_price=as_float(max_price),
-        min_rating=as_float(min_rating),
-        category=category,
-        debug=debug,
-    )
 
+def _search_options(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "min_price": _as_float(payload.get("min_price")),
+        "max_price": _as_float(payload.get("max_price")),
+        "min_rating": _as_float(payload.get("min_rating")),
+        "category": payload.get("category") or None,
+        "debug": bool(payload.get("debug", False)),
+    }
+
+
+def _serialize_results(search_engine: ProductSearchEngine, results: List[SearchResult]) -> List[Dict[str, Any]]:
     serialized: List[Dict[str, Any]] = []
     for row in results:
-        product = row.product
+        product = search_engine.get_row(row.doc_id)
         serialized.append(
             {
                 "title": product["title"],
@@ -93,8 +113,45 @@ def search() -> Any:
                 },
             }
         )
+    return serialized
+
+
+@app.route("/search", methods=["POST"])
+def search() -> Any:
+    if startup_error:
+        return jsonify({"error": startup_error}), 500
+
+    assert engine is not None
+    payload: Dict[str, Any] = request.get_json(silent=True) or {}
+    query = str(payload.get("query", "")).strip()
+
+    results, diagnostics = engine.search(query, **_search_options(payload))
+    return jsonify({"results": _serialize_results(engine, results), "diagnostics": diagnostics})
+
+
+@app.route("/search_batch", methods=["POST"])
+def search_batch() -> Any:
+    if startup_error:
+        return jsonify({"error": startup_error}), 500
 
-    return jsonify({"results": serialized, "diagnostics": diagnostics})
+    assert engine is not None
+    payload: Dict[str, Any] = request.get_json(silent=True) or {}
+    raw_queries = payload.get("queries")
+    if not isinstance(raw_queries, list):
+        return jsonify({"error": "Le champ 'queries' doit être une liste de requêtes."}), 400
+    if len(raw_queries) > MAX_BATCH_QUERIES:
+        return jsonify({"error": f"Trop de requêtes dans le lot (maximum {MAX_BATCH_QUERIES})."}), 400
+    queries = [str(query).strip() for query in raw_queries]
+
+    batch = engine.search_batch(queries, **_search_options(payload))
+    return jsonify(
+        {
+            "batches": [
+                {"query": query, "results": _serialize_results(engine, results), "diagnostics": diagnostics}
+                for query, (results, diagnostics) in zip(queries, batch)
+            ]
+        }
+    )
 
 
 if __name__ == "__main__":
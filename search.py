@@ -4,18 +4,73 @@ from __future__ import annotations
 
 import csv
 import math
+import os
+import pickle
+import tempfile
 import time
-from collections import Counter, defaultdict
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from difflib import SequenceMatcher
-from typing import Dict, List, Optional, Tuple
-
-from utils import detect_columns, parse_numeric, tokenize
+from operator import itemgetter
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from scipy import sparse
+
+from utils import detect_columns, parse_numeric, token_map_digest, tokenize, tokenize_many
+
+TFIDF_WEIGHT = 0.72
+FUZZY_WEIGHT = 0.22
+CATEGORY_BONUS = 0.12
+BRAND_BONUS = 0.08
+
+# Bump whenever the persisted index layout or the way it is derived from the CSV changes.
+INDEX_FORMAT_VERSION = 5
+_INDEX_ARRAYS = ("idf", "postings_indptr", "postings_docs", "row_ids", "prices", "ratings", "category_ids")
+_INDEX_MATRICES = ("doc_matrix", "category_matrix", "brand_matrix")
+_CSV_FIELDS = ("title", "description", "category", "brand", "image_url", "url", "price", "rating")
+_INDEX_OBJECTS = (
+    "titles",
+    "descriptions",
+    "product_categories",
+    "brands",
+    "image_urls",
+    "urls",
+    "vocab",
+    "category_to_id",
+    "title_keys",
+    "token_sets",
+    "categories",
+)
+
+
+def combine_scores(
+    tfidf: np.ndarray, fuzzy: np.ndarray, category_hits: np.ndarray, brand_hits: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Blend per-candidate signals into final scores; returns (final, bonus) arrays."""
+    bonus = category_hits * CATEGORY_BONUS + brand_hits * BRAND_BONUS
+    final = (TFIDF_WEIGHT * tfidf) + (FUZZY_WEIGHT * fuzzy) + bonus
+    return final, bonus
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k highest scores, best first; ties keep their original order."""
+    if k <= 0 or not len(scores):
+        return np.zeros(0, dtype=np.intp)
+    if len(scores) > k:
+        kth = np.partition(scores, len(scores) - k)[len(scores) - k]
+        above = np.nonzero(scores > kth)[0]
+        ties = np.nonzero(scores == kth)[0][: k - len(above)]
+        selected = np.sort(np.concatenate([above, ties]))
+    else:
+        selected = np.arange(len(scores))
+    return selected[np.argsort(-scores[selected], kind="stable")]
 
 
 @dataclass
 class SearchResult:
-    product: Dict[str, object]
+    doc_id: int
     score: float
     tfidf_score: float
     fuzzy_score: float
@@ -26,126 +81,369 @@ class SearchResult:
 class ProductSearchEngine:
     """Precomputed lexical engine for product search."""
 
-    def __init__(self, csv_path: str, column_override: Optional[Dict[str, str]] = None) -> None:
+    def __init__(
+        self,
+        csv_path: str,
+        column_override: Optional[Dict[str, str]] = None,
+        *,
+        persist_index: bool = True,
+    ) -> None:
         self.csv_path = csv_path
         self.column_override = column_override or {}
-        self.products: List[Dict[str, object]] = []
-        self.doc_vectors: List[Dict[str, float]] = []
-        self.doc_norms: List[float] = []
-        self.idf: Dict[str, float] = {}
+        self.persist_index = persist_index
+        self.index_loaded_from_disk = False
+        # Product metadata is stored column-wise; get_row() builds a dict for one product on demand.
+        self.titles: List[str] = []
+        self.descriptions: List[str] = []
+        self.product_categories: List[str] = []
+        self.brands: List[str] = []
+        self.image_urls: List[str] = []
+        self.urls: List[str] = []
+        self.row_ids: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.vocab: Dict[str, int] = {}
+        self.doc_matrix: sparse.csr_matrix = sparse.csr_matrix((0, 0), dtype=np.float64)
+        self.category_matrix: sparse.csr_matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.brand_matrix: sparse.csr_matrix = sparse.csr_matrix((0, 0), dtype=np.float32)
+        self.idf: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.postings_indptr: np.ndarray = np.zeros(1, dtype=np.int32)
+        self.postings_docs: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.prices: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.ratings: np.ndarray = np.zeros(0, dtype=np.float64)
+        self.category_ids: np.ndarray = np.zeros(0, dtype=np.int32)
+        self.category_to_id: Dict[str, int] = {}
+        self.title_keys: List[str] = []
+        self.token_sets: List[FrozenSet[str]] = []
         self.categories: List[str] = []
         self.last_index_build_ms: float = 0.0
-        self.load_data()
+        # The key is read once, before the CSV is parsed: if the file changes mid-build,
+        # the saved index carries the old key and is rebuilt on the next start.
+        index_key = self._index_key() if persist_index else None
+        if index_key is None or not self._load_index(index_key):
+            self.load_data()
+            if index_key is not None:
+                self._save_index(index_key)
+
+    @property
+    def index_paths(self) -> Tuple[str, str]:
+        """Numeric arrays (.npz) and Python metadata (.pkl) persisted next to the CSV."""
+        return f"{self.csv_path}.idx.npz", f"{self.csv_path}.meta.pkl"
+
+    def _index_key(self) -> Optional[Dict[str, object]]:
+        """Freshness key for the persisted index, or None when the CSV cannot be stat'ed."""
+        try:
+            stat = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "csv_mtime_ns": stat.st_mtime_ns,
+            "csv_size": stat.st_size,
+            "column_override": dict(self.column_override),
+            "token_map": token_map_digest(),
+        }
+
+    def _save_index(self, index_key: Dict[str, object]) -> None:
+        """Persist the built index; failures (read-only dir, full disk) only cost a rebuild next start."""
+        arrays_path, meta_path = self.index_paths
+        arrays = {name: getattr(self, name) for name in _INDEX_ARRAYS}
+        for name in _INDEX_MATRICES:
+            matrix = getattr(self, name)
+            arrays[f"{name}.data"] = matrix.data
+            arrays[f"{name}.indices"] = matrix.indices
+            arrays[f"{name}.indptr"] = matrix.indptr
+            arrays[f"{name}.shape"] = np.asarray(matrix.shape, dtype=np.int64)
+        meta = {name: getattr(self, name) for name in _INDEX_OBJECTS}
+        meta["key"] = index_key
+        # Both files carry the same id so a reader never pairs them across two different builds.
+        build_id = uuid.uuid4().hex
+        meta["build_id"] = build_id
+        arrays["build_id"] = np.asarray(build_id)
+
+        # Each writer uses its own temporary files, then renames them into place, so
+        # concurrent workers neither clobber each other's writes nor read a partial index.
+        temp_paths: List[str] = []
+        try:
+            for final_path, write in (
+                (arrays_path, lambda f: np.savez(f, **arrays)),
+                (meta_path, lambda f: pickle.dump(meta, f, protocol=pickle.HIGHEST_PROTOCOL)),
+            ):
+                fd, temp_path = tempfile.mkstemp(
+                    dir=os.path.dirname(final_path) or ".", prefix=f"{os.path.basename(final_path)}.", suffix=".tmp"
+                )
+                temp_paths.append(temp_path)
+                with os.fdopen(fd, "wb") as f:
+                    write(f)
+            os.replace(temp_paths[0], arrays_path)
+            os.replace(temp_paths[1], meta_path)
+        except OSError:
+            for temp_path in temp_paths:
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+    def _load_index(self, index_key: Dict[str, object]) -> bool:
+        """Load a persisted index if it matches the current CSV; returns False on miss or stale data."""
+        start = time.perf_counter()
+        arrays_path, meta_path = self.index_paths
+        try:
+            with open(meta_path, "rb") as f:
+                meta = pickle.load(f)
+            if not isinstance(meta, dict) or meta.get("key") != index_key:
+                return False
+            with np.load(arrays_path, allow_pickle=False) as arrays:
+                loaded = {name: arrays[name] for name in arrays.files}
+            if str(loaded["build_id"]) != meta["build_id"]:
+                return False
+            state: Dict[str, object] = {name: meta[name] for name in _INDEX_OBJECTS}
+            state.update((name, loaded[name]) for name in _INDEX_ARRAYS)
+            for name in _INDEX_MATRICES:
+                state[name] = sparse.csr_matrix(
+                    (loaded[f"{name}.data"], loaded[f"{name}.indices"], loaded[f"{name}.indptr"]),
+                    shape=tuple(int(dim) for dim in loaded[f"{name}.shape"]),
+                )
+        except Exception:  # noqa: BLE001 - any unreadable/corrupt index just triggers a rebuild
+            return False
+
+        for name, value in state.items():
+            setattr(self, name, value)
+        self.index_loaded_from_disk = True
+        self.last_index_build_ms = (time.perf_counter() - start) * 1000
+        return True
 
     def load_data(self) -> None:
         start = time.perf_counter()
         with open(self.csv_path, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            if not reader.fieldnames:
+            reader = csv.reader(f)
+            headers = next(reader, None)
+            if not headers:
                 raise ValueError("Le fichier CSV ne contient pas d'en-têtes de colonnes.")
 
-            columns = detect_columns(reader.fieldnames, self.column_override)
+            columns = detect_columns(headers, self.column_override)
             if not columns.get("title"):
                 raise ValueError(
                     "Impossible de détecter une colonne titre. Configurez COLUMN_MAP_JSON, ex: {'title': 'product_name'}."
                 )
 
-            products: List[Dict[str, object]] = []
-            category_set = set()
-            tokenized_docs: List[List[str]] = []
+            # Rows stay plain lists: unmapped fields point at a trailing "" sentinel cell.
+            width = len(headers)
+            positions = {header.strip(): pos for pos, header in enumerate(headers)}
+            extract = itemgetter(
+                *(positions.get(columns[field], width) if columns[field] else width for field in _CSV_FIELDS)
+            )
+            padding = [""] * width
 
-            for idx, row in enumerate(reader):
-                title = (row.get(columns["title"], "") if columns["title"] else "").strip()
+            category_set = set()
+            row_ids: List[int] = []
+            titles: List[str] = []
+            descriptions: List[str] = []
+            doc_categories: List[str] = []
+            brands: List[str] = []
+            image_urls: List[str] = []
+            urls: List[str] = []
+            searchable_texts: List[str] = []
+            prices: List[float] = []
+            ratings: List[float] = []
+            category_tokens: List[List[str]] = []
+            brand_tokens: List[List[str]] = []
+
+            for idx, row in enumerate(row for row in reader if row):
+                if len(row) != width:
+                    row = (row + padding)[:width]
+                row.append("")
+                title, description, category, brand, image_url, url, raw_price, raw_rating = extract(row)
+                title = title.strip()
                 if not title:
                     continue
-                description = (row.get(columns["description"], "") if columns["description"] else "").strip()
-                category = (row.get(columns["category"], "") if columns["category"] else "").strip()
-                brand = (row.get(columns["brand"], "") if columns["brand"] else "").strip()
-                image_url = (row.get(columns["image_url"], "") if columns["image_url"] else "").strip()
-                url = (row.get(columns["url"], "") if columns["url"] else "").strip()
-                price = parse_numeric(row.get(columns["price"]) if columns["price"] else None)
-                rating = parse_numeric(row.get(columns["rating"]) if columns["rating"] else None)
+                description = description.strip()
+                category = category.strip()
+                brand = brand.strip()
+                image_url = image_url.strip()
+                url = url.strip()
+                price = parse_numeric(raw_price)
+                rating = parse_numeric(raw_rating)
 
                 text_parts = [title, description, category, brand]
-                merged_tokens = tokenize(" ".join(part for part in text_parts if part))
-                searchable_text = " ".join(merged_tokens)
-
-                product = {
-                    "id": idx,
-                    "title": title,
-                    "description": description,
-                    "category": category,
-                    "brand": brand,
-                    "price": price,
-                    "rating": rating,
-                    "image_url": image_url,
-                    "url": url,
-                    "searchable_text": searchable_text,
-                }
-                products.append(product)
-                tokenized_docs.append(merged_tokens)
+
+                row_ids.append(idx)
+                titles.append(title)
+                descriptions.append(description)
+                doc_categories.append(category)
+                brands.append(brand)
+                image_urls.append(image_url)
+                urls.append(url)
+                searchable_texts.append(" ".join(part for part in text_parts if part))
+                prices.append(math.nan if price is None else price)
+                ratings.append(math.nan if rating is None else rating)
+                category_tokens.append(tokenize(category))
+                brand_tokens.append(tokenize(brand))
                 if category:
                     category_set.add(category)
 
-        if not products:
+        if not titles:
             raise ValueError("Aucun produit valide trouvé dans le CSV.")
 
-        self.products = products
+        tokenized_docs = tokenize_many(searchable_texts)
+
+        self.row_ids = np.asarray(row_ids, dtype=np.int32)
+        self.titles = titles
+        self.descriptions = descriptions
+        self.product_categories = doc_categories
+        self.brands = brands
+        self.image_urls = image_urls
+        self.urls = urls
+        self.title_keys = [self._fuzzy_key(tokens) for tokens in tokenize_many(titles)]
+        self.token_sets = [frozenset(tokens) for tokens in tokenized_docs]
         self._build_tfidf(tokenized_docs)
+        self.category_matrix = self._presence_matrix(category_tokens)
+        self.brand_matrix = self._presence_matrix(brand_tokens)
         self.categories = sorted(category_set)
+        self.category_to_id = {name: cid for cid, name in enumerate(self.categories)}
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.ratings = np.asarray(ratings, dtype=np.float64)
+        self.category_ids = np.asarray(
+            [self.category_to_id.get(name, -1) for name in doc_categories], dtype=np.int32
+        )
         self.last_index_build_ms = (time.perf_counter() - start) * 1000
 
+    def get_row(self, doc_id: int) -> Dict[str, object]:
+        """Materialize one product as a dict (missing price/rating become None)."""
+        price = float(self.prices[doc_id])
+        rating = float(self.ratings[doc_id])
+        return {
+            "id": int(self.row_ids[doc_id]),
+            "title": self.titles[doc_id],
+            "description": self.descriptions[doc_id],
+            "category": self.product_categories[doc_id],
+            "brand": self.brands[doc_id],
+            "price": None if math.isnan(price) else price,
+            "rating": None if math.isnan(rating) else rating,
+            "image_url": self.image_urls[doc_id],
+            "url": self.urls[doc_id],
+        }
+
     def _build_tfidf(self, tokenized_docs: List[List[str]]) -> None:
         doc_count = len(tokenized_docs)
-        doc_freq: Dict[str, int] = defaultdict(int)
-
-        for tokens in tokenized_docs:
-            for token in set(tokens):
-                doc_freq[token] += 1
-
-        self.idf = {
-            token: math.log((1 + doc_count) / (1 + freq)) + 1.0
-            for token, freq in doc_freq.items()
+        self.vocab = {
+            token: token_id
+            for token_id, token in enumerate(sorted({token for tokens in tokenized_docs for token in tokens}))
         }
+        vocab_size = len(self.vocab)
+
+        doc_lengths = np.fromiter((len(tokens) for tokens in tokenized_docs), dtype=np.int64, count=doc_count)
+        token_ids = np.fromiter(
+            (self.vocab[token] for tokens in tokenized_docs for token in tokens),
+            dtype=np.int64,
+            count=int(doc_lengths.sum()),
+        )
+        doc_ids = np.repeat(np.arange(doc_count, dtype=np.int64), doc_lengths)
+
+        # One key per (doc, token) pair; np.unique returns them sorted by doc then token, i.e. CSR order.
+        keys, counts = np.unique(doc_ids * vocab_size + token_ids, return_counts=True)
+        rows = keys // max(vocab_size, 1)
+        cols = keys % max(vocab_size, 1)
+
+        doc_freq = np.bincount(cols, minlength=vocab_size)
+        self.idf = np.log((1 + doc_count) / (1 + doc_freq)) + 1.0
+
+        values = (counts / doc_lengths[rows]) * self.idf[cols]
+        norms = np.sqrt(np.bincount(rows, weights=values * values, minlength=doc_count))
+        values /= norms[rows]
+        indptr = np.zeros(doc_count + 1, dtype=np.int32)
+        np.cumsum(np.bincount(rows, minlength=doc_count), out=indptr[1:])
+
+        self.doc_matrix = sparse.csr_matrix(
+            (values, cols.astype(np.int32), indptr),
+            shape=(doc_count, vocab_size),
+        )
+        by_token = self.doc_matrix.tocsc()
+        by_token.sort_indices()
+        self.postings_indptr = by_token.indptr
+        self.postings_docs = by_token.indices
+
+    def _presence_matrix(self, token_lists: List[List[str]]) -> sparse.csr_matrix:
+        """Binary doc x vocab matrix marking which indexed tokens occur in one product field."""
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        for tokens in token_lists:
+            indices.extend(sorted({self.vocab[token] for token in tokens if token in self.vocab}))
+            indptr.append(len(indices))
+        return sparse.csr_matrix(
+            (
+                np.ones(len(indices), dtype=np.float32),
+                np.asarray(indices, dtype=np.int32),
+                np.asarray(indptr, dtype=np.int32),
+            ),
+            shape=(len(token_lists), len(self.vocab)),
+        )
+
+    def _token_ids(self, tokens: List[str]) -> np.ndarray:
+        return np.asarray([self.vocab[token] for token in tokens if token in self.vocab], dtype=np.int32)
+
+    def _query_vector(self, query_ids: np.ndarray, token_count: int) -> np.ndarray:
+        """L2-normalized query vector (all zeros when no token is indexed)."""
+        vector = np.zeros(len(self.vocab), dtype=np.float64)
+        if not len(query_ids):
+            return vector
+        ids, counts = np.unique(query_ids, return_counts=True)
+        vector[ids] = (counts / token_count) * self.idf[ids]
+        vector /= np.linalg.norm(vector)
+        return vector
+
+    def _cosine_scores(self, qvec: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Cosine similarity of the unit query against the given (unit) document rows in one SpMV."""
+        if not len(rows):
+            return np.zeros(0, dtype=np.float64)
+        return self.doc_matrix[rows] @ qvec
+
+    def _candidates(self, query_ids: np.ndarray, mask: np.ndarray) -> np.ndarray:
+        """Documents sharing at least one token with the query, restricted to the filter mask.
+
+        Falls back to every filtered document when no query token is indexed, so
+        misspelled queries can still be matched on title similarity alone.
+        """
+        if not len(query_ids):
+            return np.nonzero(mask)[0]
+        docs = np.unique(
+            np.concatenate(
+                [self.postings_docs[self.postings_indptr[tid] : self.postings_indptr[tid + 1]] for tid in set(query_ids)]
+            )
+        )
+        return docs[mask[docs]]
 
-        self.doc_vectors = []
-        self.doc_norms = []
-        for tokens in tokenized_docs:
-            counts = Counter(tokens)
-            total = len(tokens) or 1
-            vector: Dict[str, float] = {}
-            for token, count in counts.items():
-                tf = count / total
-                vector[token] = tf * self.idf.get(token, 0.0)
-            norm = math.sqrt(sum(value * value for value in vector.values()))
-            self.doc_vectors.append(vector)
-            self.doc_norms.append(norm)
-
-    def _query_vector(self, query_tokens: List[str]) -> Tuple[Dict[str, float], float]:
-        counts = Counter(query_tokens)
-        total = len(query_tokens) or 1
-        vector: Dict[str, float] = {}
-        for token, count in counts.items():
-            if token in self.idf:
-                vector[token] = (count / total) * self.idf[token]
-        norm = math.sqrt(sum(value * value for value in vector.values()))
-        return vector, norm
+    def _filter_mask(
+        self,
+        *,
+        min_price: Optional[float],
+        max_price: Optional[float],
+        category: Optional[str],
+        min_rating: Optional[float],
+    ) -> np.ndarray:
+        """Boolean mask of documents passing the filters; missing values (NaN) never match."""
+        mask = np.ones(len(self.titles), dtype=bool)
+        if min_price is not None:
+            mask &= self.prices >= min_price
+        if max_price is not None:
+            mask &= self.prices <= max_price
+        if category:
+            # Non-string values (e.g. a list from a JSON payload) match no category rather than raising.
+            category_id = self.category_to_id.get(category, -2) if isinstance(category, str) else -2
+            mask &= self.category_ids == category_id
+        if min_rating is not None:
+            mask &= self.ratings >= min_rating
+        return mask
 
     @staticmethod
-    def _cosine_similarity(qvec: Dict[str, float], qnorm: float, dvec: Dict[str, float], dnorm: float) -> float:
-        if qnorm == 0 or dnorm == 0:
-            return 0.0
-        dot = sum(weight * dvec.get(token, 0.0) for token, weight in qvec.items())
-        return dot / (qnorm * dnorm)
+    def _fuzzy_key(tokens: List[str]) -> str:
+        return " ".join(sorted(set(tokens)))
 
-    @staticmethod
-    def _fuzzy_score(query_tokens: List[str], title: str) -> float:
-        title_tokens = tokenize(title)
-        if not title_tokens:
-            return 0.0
-        q = " ".join(sorted(set(query_tokens)))
-        t = " ".join(sorted(set(title_tokens)))
-        return SequenceMatcher(None, q, t).ratio()
+    def _fuzzy_scores(self, query_tokens: List[str], rows: np.ndarray) -> np.ndarray:
+        """Normalized Indel similarity (0-1) between the query and the given titles, scored in one batch."""
+        if not len(rows):
+            return np.zeros(0, dtype=np.float64)
+        titles = [self.title_keys[idx] for idx in rows]
+        ratios = process.cdist([self._fuzzy_key(query_tokens)], titles, scorer=fuzz.ratio, dtype=np.float64)
+        return ratios[0] / 100.0
 
     def search(
         self,
@@ -163,64 +461,46 @@ class ProductSearchEngine:
             "query_tokens": query_tokens,
             "index_build_ms": round(self.last_index_build_ms, 2),
             "query_time_ms": 0.0,
-            "total_products": len(self.products),
+            "total_products": len(self.titles),
         }
         if not query_tokens:
             return [], diagnostics
 
         start = time.perf_counter()
-        qvec, qnorm = self._query_vector(query_tokens)
-
-        results: List[SearchResult] = []
-        for idx, product in enumerate(self.products):
-            price = product["price"]
-            rating = product["rating"]
-            if min_price is not None and (price is None or price < min_price):
-                continue
-            if max_price is not None and (price is None or price > max_price):
-                continue
-            if category and product.get("category") != category:
-                continue
-            if min_rating is not None and (rating is None or rating < min_rating):
-                continue
-
-            tfidf_score = self._cosine_similarity(qvec, qnorm, self.doc_vectors[idx], self.doc_norms[idx])
-            fuzzy_score = self._fuzzy_score(query_tokens, str(product["title"]))
-            token_set = set(query_tokens)
-            matched_tokens = sorted(token_set.intersection(set(product["searchable_text"].split())))
-
-            category_bonus = 0.0
-            if product.get("category"):
-                category_tokens = set(tokenize(str(product["category"])))
-                if token_set.intersection(category_tokens):
-                    category_bonus += 0.12
-            if product.get("brand"):
-                brand_tokens = set(tokenize(str(product["brand"])))
-                if token_set.intersection(brand_tokens):
-                    category_bonus += 0.08
-
-            final_score = (0.72 * tfidf_score) + (0.22 * fuzzy_score) + category_bonus
-            if final_score <= 0:
-                continue
-
-            results.append(
+        query_ids = self._token_ids(query_tokens)
+        qvec = self._query_vector(query_ids, len(query_tokens))
+        mask = self._filter_mask(min_price=min_price, max_price=max_price, category=category, min_rating=min_rating)
+        candidate_idx = self._candidates(query_ids, mask)
+        tfidf_scores = self._cosine_scores(qvec, candidate_idx)
+        fuzzy_scores = self._fuzzy_scores(query_tokens, candidate_idx)
+
+        query_indicator = np.zeros(len(self.vocab), dtype=np.float32)
+        query_indicator[query_ids] = 1.0
+        category_hits = (self.category_matrix[candidate_idx] @ query_indicator) > 0
+        brand_hits = (self.brand_matrix[candidate_idx] @ query_indicator) > 0
+        final_scores, bonuses = combine_scores(tfidf_scores, fuzzy_scores, category_hits, brand_hits)
+
+        token_set = frozenset(query_tokens)
+        positive = np.nonzero(final_scores > 0)[0]
+        trimmed: List[SearchResult] = []
+        for pos in positive[top_k_indices(final_scores[positive], limit)]:
+            idx = candidate_idx[pos]
+            trimmed.append(
                 SearchResult(
-                    product=product,
-                    score=final_score,
-                    tfidf_score=tfidf_score,
-                    fuzzy_score=fuzzy_score,
-                    category_bonus=category_bonus,
-                    matched_tokens=matched_tokens,
+                    doc_id=int(idx),
+                    score=float(final_scores[pos]),
+                    tfidf_score=float(tfidf_scores[pos]),
+                    fuzzy_score=float(fuzzy_scores[pos]),
+                    category_bonus=float(bonuses[pos]),
+                    matched_tokens=sorted(token_set & self.token_sets[idx]),
                 )
             )
 
-        results.sort(key=lambda item: item.score, reverse=True)
-        trimmed = results[:limit]
         diagnostics["query_time_ms"] = round((time.perf_counter() - start) * 1000, 2)
         if debug:
             diagnostics["top_scores"] = [
                 {
-                    "title": r.product["title"],
+                    "title": self.titles[r.doc_id],
                     "final": round(r.score, 4),
                     "tfidf": round(r.tfidf_score, 4),
                     "fuzzy": round(r.fuzzy_score, 4),
@@ -230,3 +510,17 @@ class ProductSearchEngine:
             ]
 
         return trimmed, diagnostics
+
+    def search_batch(
+        self, queries: Sequence[str], **kwargs: Any
+    ) -> List[Tuple[List[SearchResult], Dict[str, object]]]:
+        """Run several queries concurrently with the same filters; results keep the input order.
+
+        The index is read-only after loading and the heavy scoring (NumPy, RapidFuzz)
+        releases the GIL, so queries are simply fanned out over a thread pool.
+        """
+        if not queries:
+            return []
+        workers = min(len(queries), os.cpu_count() or 1)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda query: self.search(query, **kwargs), queries))
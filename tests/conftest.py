@@ -1,6 +1,24 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
+
+from search import ProductSearchEngine  # noqa: E402
+
+SAMPLE_CSV = """title,description,selling_price,average_rating,category,brand\nChaussure Running Homme,Imperméable pour pluie,89.9,4.5,Sport,Nike\nOrdinateur Portable Étudiant,léger et rapide,799,4.7,Informatique,Lenovo\nTéléphone 5G,grand écran et batterie,499,4.2,Mobile,Samsung\nMug Cadeau Anniversaire,idée cadeau personnalisée,19.9,4.0,Maison,GiftCo\nChaise de bureau ergonomique,confort dos,159,4.1,Mobilier,FlexSeat\n"""
+
+
+@pytest.fixture
+def sample_csv(tmp_path: Path) -> Path:
+    csv_path = tmp_path / "products.csv"
+    csv_path.write_text(SAMPLE_CSV, encoding="utf-8")
+    return csv_path
+
+
+@pytest.fixture
+def engine(sample_csv: Path) -> ProductSearchEngine:
+    return ProductSearchEngine(str(sample_csv))
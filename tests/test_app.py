@@ -0,0 +1,58 @@
+import pytest
+from flask.testing import FlaskClient
+
+import app as app_module
+from search import ProductSearchEngine
+
+
+@pytest.fixture
+def client(engine: ProductSearchEngine, monkeypatch: pytest.MonkeyPatch) -> FlaskClient:
+    monkeypatch.setattr(app_module, "engine", engine)
+    monkeypatch.setattr(app_module, "startup_error", None)
+    return app_module.app.test_client()
+
+
+def test_search_batch_returns_one_batch_per_query(client: FlaskClient) -> None:
+    response = client.post("/search_batch", json={"queries": ["cadeaux anniv", " ordinateur "], "max_price": 500})
+
+    assert response.status_code == 200
+    batches = response.get_json()["batches"]
+    assert [batch["query"] for batch in batches] == ["cadeaux anniv", "ordinateur"]
+    assert batches[0]["results"][0]["title"] == "Mug Cadeau Anniversaire"
+    assert batches[1]["results"] == []
+    assert set(batches[0]["diagnostics"]) >= {"query_tokens", "query_time_ms", "total_products"}
+
+
+def test_search_batch_rejects_non_list_and_oversized_batches(
+    client: FlaskClient, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    response = client.post("/search_batch", json={"queries": "ordinateur"})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+    monkeypatch.setattr(app_module, "MAX_BATCH_QUERIES", 2)
+    response = client.post("/search_batch", json={"queries": ["a", "b", "c"]})
+    assert response.status_code == 400
+    assert "error" in response.get_json()
+
+
+def test_search_returns_orjson_encoded_results(client: FlaskClient) -> None:
+    response = client.post("/search", json={"query": "chaussur runing pluie", "debug": True})
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    payload = response.get_json()
+    top = payload["results"][0]
+    assert top["title"] == "Chaussure Running Homme"
+    assert top["price"] == 89.9
+    assert top["brand"] == "Nike"
+    assert payload["diagnostics"]["query_tokens"] == ["chaussure", "running", "pluie"]
+    assert payload["diagnostics"]["top_scores"][0]["title"] == "Chaussure Running Homme"
+
+
+def test_search_with_malformed_json_falls_back_to_empty_query(client: FlaskClient) -> None:
+    response = client.post("/search", data="{not json", content_type="application/json")
+
+    assert response.status_code == 200
+    assert response.mimetype == "application/json"
+    assert response.get_json()["results"] == []
@@ -0,0 +1,175 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import utils
+from search import ProductSearchEngine, top_k_indices
+
+LAMP_ROW = "Lampe de bureau LED,lumière douce,29.9,4.3,Maison,Lumix\n"
+
+
+def test_search_ranking_with_typos_and_synonyms(engine: ProductSearchEngine) -> None:
+    results_typos, debug_typos = engine.search("chaussur runing pluie", debug=True)
+    assert results_typos
+    assert engine.titles[results_typos[0].doc_id] == "Chaussure Running Homme"
+    assert "top_scores" in debug_typos
+
+    results_synonyms, _ = engine.search("cadeaux anniv")
+    assert results_synonyms
+    assert engine.titles[results_synonyms[0].doc_id] == "Mug Cadeau Anniversaire"
+
+
+def test_search_filters_on_price_rating_and_category(engine: ProductSearchEngine) -> None:
+    results, _ = engine.search("chaise telephone ordinateur", min_price=100, max_price=500)
+    assert {engine.titles[r.doc_id] for r in results} == {"Téléphone 5G", "Chaise de bureau ergonomique"}
+
+    results, _ = engine.search("chaussure ordinateur cadeau", min_rating=4.5)
+    assert {engine.titles[r.doc_id] for r in results} == {"Chaussure Running Homme", "Ordinateur Portable Étudiant"}
+
+    results, _ = engine.search("ordinateur", category="Informatique")
+    assert [engine.titles[r.doc_id] for r in results] == ["Ordinateur Portable Étudiant"]
+
+    results, _ = engine.search("ordinateur", category="Inconnue")
+    assert results == []
+
+    results, _ = engine.search("ordinateur", category=["Informatique"])  # type: ignore[arg-type]
+    assert results == []
+
+
+def test_search_scores_only_lexical_matches_with_fuzzy_fallback(engine: ProductSearchEngine) -> None:
+    results, _ = engine.search("ordinateur")
+    assert [engine.titles[r.doc_id] for r in results] == ["Ordinateur Portable Étudiant"]
+
+    results_typo, _ = engine.search("ordinatuer portabel")
+    assert results_typo
+    assert engine.titles[results_typo[0].doc_id] == "Ordinateur Portable Étudiant"
+
+
+def test_search_batch_matches_individual_searches(engine: ProductSearchEngine) -> None:
+    queries = ["chaussur runing pluie", "cadeaux anniv", "", "ordinateur"]
+
+    batch = engine.search_batch(queries, max_price=800)
+    assert len(batch) == len(queries)
+    for query, (results, _) in zip(queries, batch):
+        expected, _ = engine.search(query, max_price=800)
+        assert [r.doc_id for r in results] == [r.doc_id for r in expected]
+
+
+def test_index_is_persisted_and_rebuilt_when_csv_changes(engine: ProductSearchEngine, sample_csv: Path) -> None:
+    first = engine
+    assert not first.index_loaded_from_disk
+
+    second = ProductSearchEngine(str(sample_csv))
+    assert second.index_loaded_from_disk
+    expected, _ = first.search("cadeaux anniv", max_price=500)
+    results, _ = second.search("cadeaux anniv", max_price=500)
+    assert [(r.doc_id, r.score) for r in results] == [(r.doc_id, r.score) for r in expected]
+
+    sample_csv.write_text(sample_csv.read_text(encoding="utf-8") + LAMP_ROW, encoding="utf-8")
+    third = ProductSearchEngine(str(sample_csv))
+    assert not third.index_loaded_from_disk
+    assert len(third.titles) == 6
+
+
+def test_csv_changed_during_build_is_not_cached_under_the_new_key(
+    sample_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    csv_path = sample_csv
+    extended_csv = csv_path.read_text(encoding="utf-8") + LAMP_ROW
+    original_load = ProductSearchEngine.load_data
+
+    def load_then_replace_csv(self: ProductSearchEngine) -> None:
+        original_load(self)
+        csv_path.write_text(extended_csv, encoding="utf-8")
+
+    monkeypatch.setattr(ProductSearchEngine, "load_data", load_then_replace_csv)
+    assert len(ProductSearchEngine(str(csv_path)).titles) == 5
+    monkeypatch.undo()
+
+    fresh = ProductSearchEngine(str(csv_path))
+    assert not fresh.index_loaded_from_disk
+    assert len(fresh.titles) == 6
+
+
+def test_csv_removed_during_build_does_not_break_construction(
+    sample_csv: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    csv_path = sample_csv
+    original_load = ProductSearchEngine.load_data
+
+    def load_then_remove_csv(self: ProductSearchEngine) -> None:
+        original_load(self)
+        csv_path.unlink()
+
+    monkeypatch.setattr(ProductSearchEngine, "load_data", load_then_remove_csv)
+    assert len(ProductSearchEngine(str(csv_path)).titles) == 5
+
+
+def test_corrupt_index_files_trigger_a_rebuild(engine: ProductSearchEngine) -> None:
+    arrays_path, meta_path = engine.index_paths
+    with open(arrays_path, "r+b") as f:
+        f.truncate(100)
+
+    rebuilt = ProductSearchEngine(engine.csv_path)
+    assert not rebuilt.index_loaded_from_disk
+    assert rebuilt.titles == engine.titles
+    assert ProductSearchEngine(engine.csv_path).index_loaded_from_disk
+
+    with open(meta_path, "wb") as f:
+        f.write(b"not a pickle")
+    assert not ProductSearchEngine(engine.csv_path).index_loaded_from_disk
+
+
+def test_concurrent_index_writers_leave_a_consistent_index(sample_csv: Path) -> None:
+    csv_path = sample_csv
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        engines = list(executor.map(lambda _: ProductSearchEngine(str(csv_path)), range(4)))
+
+    reloaded = ProductSearchEngine(str(csv_path))
+    assert reloaded.index_loaded_from_disk
+    assert reloaded.titles == engines[0].titles
+    assert sorted(path.name for path in csv_path.parent.iterdir()) == [
+        "products.csv",
+        "products.csv.idx.npz",
+        "products.csv.meta.pkl",
+    ]
+
+
+def test_index_is_rebuilt_when_synonyms_change(engine: ProductSearchEngine, monkeypatch: pytest.MonkeyPatch) -> None:
+    csv_path = engine.csv_path
+    assert ProductSearchEngine(csv_path).index_loaded_from_disk
+
+    monkeypatch.setitem(utils._TOKEN_MAP, "jogging", "running")
+    assert not ProductSearchEngine(csv_path).index_loaded_from_disk
+
+
+def test_load_tolerates_padded_headers_blank_lines_and_short_rows(tmp_path: Path) -> None:
+    csv_path = tmp_path / "messy.csv"
+    csv_path.write_text(
+        # Leading unnamed column, as written by pandas' to_csv with its index.
+        ", title ,price,category\n0,Lampe LED,29.9,Maison\n\n1,Tapis salon\n2,,12,Maison\n", encoding="utf-8"
+    )
+    engine = ProductSearchEngine(str(csv_path), persist_index=False)
+
+    assert engine.titles == ["Lampe LED", "Tapis salon"]
+    assert engine.categories == ["Maison"]
+    assert engine.get_row(1) == {
+        "id": 1,
+        "title": "Tapis salon",
+        "description": "",
+        "category": "",
+        "brand": "",
+        "price": None,
+        "rating": None,
+        "image_url": "",
+        "url": "",
+    }
+
+
+def test_top_k_indices_orders_best_first_and_keeps_tie_order() -> None:
+    scores = np.array([0.2, 0.9, 0.5, 0.9, 0.5, 0.1])
+    assert top_k_indices(scores, 3).tolist() == [1, 3, 2]
+    assert top_k_indices(scores, 10).tolist() == [1, 3, 2, 4, 0, 5]
+    assert top_k_indices(scores, 0).tolist() == []
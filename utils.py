@@ -2,10 +2,12 @@
 
 from __future__ import annotations
 
+import hashlib
 import json
 import re
 import unicodedata
-from typing import Dict, Iterable, List, Optional, Sequence
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
 STOPWORDS_FR_EN = {
     "a",
@@ -66,6 +68,23 @@ SYNONYMS = {
     "chaussur": "chaussure",
 }
 
+
+def _build_token_map() -> Dict[str, Optional[str]]:
+    """Fold synonyms and stopwords into one lookup: canonical token, or None to drop it."""
+    token_map: Dict[str, Optional[str]] = dict.fromkeys(STOPWORDS_FR_EN)
+    for token, canonical in SYNONYMS.items():
+        token_map[token] = None if canonical in STOPWORDS_FR_EN else canonical
+    return token_map
+
+
+_TOKEN_MAP = _build_token_map()
+
+
+def token_map_digest() -> str:
+    """Fingerprint of the synonym/stopword table, for invalidating indexes built with another one."""
+    return hashlib.sha256(repr(sorted(_TOKEN_MAP.items())).encode("utf-8")).hexdigest()
+
+
 COLUMN_CANDIDATES: Dict[str, Sequence[str]] = {
     "title": ("title", "name", "product_name", "nom", "titre", "product"),
     "description": ("description", "desc", "details", "content"),
@@ -78,19 +97,43 @@ COLUMN_CANDIDATES: Dict[str, Sequence[str]] = {
 }
 
 
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_WHITESPACE_RE = re.compile(r"\s+")
+_NON_ASCII_RUN_RE = re.compile(r"[^\x00-\x7f]+")
+
+
+class _MarkTable(dict):
+    """``str.translate`` table deleting nonspacing marks (Mn), filled lazily per code point."""
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        value = None if unicodedata.category(chr(codepoint)) == "Mn" else codepoint
+        self[codepoint] = value
+        return value
+
+
+_MARK_TABLE = _MarkTable()
+
+
+def _strip_marks(match: "re.Match[str]") -> str:
+    return match.group().translate(_MARK_TABLE)
+
+
 def strip_accents(text: str) -> str:
     """Remove accents for robust lexical matching."""
     normalized = unicodedata.normalize("NFD", text)
-    return "".join(char for char in normalized if unicodedata.category(char) != "Mn")
+    if normalized.isascii():
+        return normalized
+    return _NON_ASCII_RUN_RE.sub(_strip_marks, normalized)
 
 
+@lru_cache(maxsize=4096)
 def normalize_text(text: Optional[str], *, keep_spaces: bool = True) -> str:
     """Lowercase, deaccent and remove punctuation/noise."""
     if not text:
         return ""
     cleaned = strip_accents(text.lower())
-    cleaned = re.sub(r"[^a-z0-9\s]", " ", cleaned)
-    cleaned = re.sub(r"\s+", " ", cleaned).strip()
+    cleaned = _NON_ALNUM_RE.sub(" ", cleaned)
+    cleaned = _WHITESPACE_RE.sub(" ", cleaned).strip()
     if keep_spaces:
         return cleaned
     return cleaned.replace(" ", "")
@@ -98,15 +141,33 @@ def normalize_text(text: Optional[str], *, keep_spaces: bool = True) -> str:
 
 def tokenize(text: Optional[str]) -> List[str]:
     """Tokenize and remove basic FR/EN stopwords while applying synonym normalization."""
+    return list(_tokenize_cached(text))
+
+
+def tokenize_many(texts: Sequence[str]) -> List[List[str]]:
+    """Tokenize a batch of texts (e.g. a whole CSV column) with one normalization pass.
+
+    Equivalent to ``[tokenize(text) for text in texts]``, but lowercasing, accent
+    stripping and punctuation removal run once over the joined corpus instead of
+    once per row, and the per-query cache is left untouched.
+    """
+    if not texts:
+        return []
+    joined = "\n".join(text.replace("\n", " ") for text in texts)
+    cleaned = _NON_ALNUM_RE.sub(" ", strip_accents(joined.lower()))
+    return [_map_tokens(line.split()) for line in cleaned.split("\n")]
+
+
+@lru_cache(maxsize=4096)
+def _tokenize_cached(text: Optional[str]) -> Tuple[str, ...]:
     normalized = normalize_text(text)
     if not normalized:
-        return []
-    tokens = []
-    for token in normalized.split():
-        mapped = SYNONYMS.get(token, token)
-        if mapped not in STOPWORDS_FR_EN and len(mapped) > 1:
-            tokens.append(mapped)
-    return tokens
+        return ()
+    return tuple(_map_tokens(normalized.split()))
+
+
+def _map_tokens(raw_tokens: List[str]) -> List[str]:
+    return [mapped for mapped in map(_TOKEN_MAP.get, raw_tokens, raw_tokens) if mapped and len(mapped) > 1]
 
 
 def parse_numeric(value: Optional[str]) -> Optional[float]: